@@ -0,0 +1,151 @@
+import functools
+import re
+import string
+import typing as tp
+
+
+class Alphabet:
+    """
+    Alphabet compiled into lookup tables for the ciphers.
+
+    Attributes:
+        size (int): Number of letters in the alphabet.
+        cases (list[str]): Letters of every case in alphabet order
+        (index -> letter).
+        indices (dict[int, int]): Code point of every letter
+        of every case -> its index in the alphabet.
+
+    Examples:
+        >>> greek = Alphabet("αβγ", "ΑΒΓ")
+        >>> greek.size, greek.indices[ord("Β")], greek.cases[0][2]
+        (3, 1, 'γ')
+    """
+
+    def __init__(self, lowercase: str, uppercase: str = "") -> None:
+        if not lowercase:
+            raise ValueError("Alphabet can not be empty")
+        if uppercase and len(uppercase) != len(lowercase):
+            raise ValueError("Cases must have the same number of letters")
+
+        self.size = len(lowercase)
+        self.cases = [lowercase] + ([uppercase] if uppercase else [])
+        self.indices = {
+            ord(char): index
+            for case in self.cases
+            for index, char in enumerate(case)
+        }
+
+        if len(self.indices) != self.size * len(self.cases):
+            raise ValueError("Alphabet letters must be unique")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Alphabet) and self.cases == other.cases
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.cases))
+
+    def __repr__(self) -> str:
+        return f"Alphabet({', '.join(map(repr, self.cases))})"
+
+
+ENGLISH = Alphabet(string.ascii_lowercase, string.ascii_uppercase)
+CYRILLIC = Alphabet(
+    "абвгдеёжзийклмнопрстуфхцчшщъыьэюя", "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+)
+DEFAULT_ALPHABETS = (ENGLISH,)
+
+
+@functools.lru_cache(maxsize=1024)
+def check_alphabets(alphabets: tp.Tuple[Alphabet, ...]) -> None:
+    """
+    Check that the alphabets can be used together.
+
+    Raises:
+        ValueError: If there are no alphabets or they share letters.
+
+    Examples:
+        >>> check_alphabets((ENGLISH, Alphabet("abc")))
+        Traceback (most recent call last):
+            ...
+        ValueError: Alphabets must not share letters
+    """
+    if not alphabets:
+        raise ValueError("At least one alphabet is required")
+
+    code_points: tp.Set[int] = set()
+    for alphabet in alphabets:
+        if not code_points.isdisjoint(alphabet.indices):
+            raise ValueError("Alphabets must not share letters")
+        code_points.update(alphabet.indices)
+
+
+@functools.lru_cache(maxsize=1024)
+def shift_table(alphabets: tp.Tuple[Alphabet, ...], shift: int) -> dict:
+    """
+    Compile a str.translate table which shifts every letter
+    of the alphabets by the given number of positions.
+
+    Args:
+        alphabets (tp.Tuple[Alphabet, ...]): Alphabets to shift.
+        shift (int): The number of positions to shift each letter.
+
+    Returns:
+        dict: Translation table (code point -> letter).
+
+    Examples:
+        >>> "Abz, Эюя!".translate(shift_table((ENGLISH, CYRILLIC), 1))
+        'Bca, Юяа!'
+    """
+    check_alphabets(alphabets)
+    table = {}
+
+    for alphabet in alphabets:
+        offset = shift % alphabet.size
+        for case in alphabet.cases:
+            shifted = case[offset:] + case[:offset]
+            table.update(str.maketrans(case, shifted))
+
+    return table
+
+
+@functools.lru_cache(maxsize=1024)
+def letter_runs(alphabets: tp.Tuple[Alphabet, ...]) -> tp.Pattern[str]:
+    """
+    Compile a regular expression which splits a text into runs
+    of letters of the alphabets (captured) and runs of other characters.
+
+    Examples:
+        >>> letter_runs(DEFAULT_ALPHABETS).split("Hi, you!")
+        ['', 'Hi', ', ', 'you', '!']
+    """
+    check_alphabets(alphabets)
+    letters = "".join(
+        chr(code_point)
+        for alphabet in alphabets
+        for code_point in alphabet.indices
+    )
+
+    return re.compile(f"([{re.escape(letters)}]+)")
+
+
+def letter_index(
+    char: str, alphabets: tp.Tuple[Alphabet, ...]
+) -> tp.Optional[int]:
+    """
+    Find the index of the letter in the first alphabet containing it.
+
+    Examples:
+        >>> letter_index("C", DEFAULT_ALPHABETS)
+        2
+        >>> letter_index("ё", (ENGLISH, CYRILLIC))
+        6
+        >>> letter_index("ё", DEFAULT_ALPHABETS) is None
+        True
+    """
+    check_alphabets(alphabets)
+    for alphabet in alphabets:
+        index = alphabet.indices.get(ord(char))
+        if index is not None:
+            return index
+
+    return None
@@ -1,50 +1,61 @@
+import collections
+import itertools
+import math
+import multiprocessing
+import operator
+import string
 import typing as tp
+from concurrent.futures import ProcessPoolExecutor
 from random import randint
-from typing import Optional
 
+from alphabet import DEFAULT_ALPHABETS, ENGLISH, Alphabet, shift_table
 from testing import accuracy_score, test
 
-A_ORD = ord("a")
-Z_ORD = ord("z")
-A_ORD_CAP = ord("A")
-Z_ORD_CAP = ord("Z")
-SIZE_OF_ALPHABET = Z_ORD - A_ORD + 1
-
-
-def get_start_ord(char_ord: int) -> Optional[int]:
-    """
-    Determine the starting ordinal value for a given character ordinal.
-
-    Args:
-        char_ord (int): The ordinal value of the character.
-
-    Returns:
-        Optional[int]: The starting ordinal value for the alphabet
-        (either lowercase 'a' or uppercase 'A') if the character is
-        an English letter. Returns None if the character is not an
-        English letter.
-    """
-
-    if A_ORD <= char_ord <= Z_ORD:
-        return A_ORD
-    elif A_ORD_CAP <= char_ord <= Z_ORD_CAP:
-        return A_ORD_CAP
-
-    return None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SIZE_OF_ALPHABET = ENGLISH.size
+CORPUS_BATCH_SIZE = 4096
+
+# Relative frequencies of English letters a-z (in percent)
+# fmt: off
+ENGLISH_LETTER_FREQUENCIES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966,
+    0.153, 0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987,
+    6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]
+# fmt: on
+
+# SHIFT_WEIGHTS[c][s] - log frequency of the letter c decrypted with shift s
+SHIFT_WEIGHTS = [
+    [
+        math.log(ENGLISH_LETTER_FREQUENCIES[(c - s) % SIZE_OF_ALPHABET])
+        for s in range(SIZE_OF_ALPHABET)
+    ]
+    for c in range(SIZE_OF_ALPHABET)
+]
 
 
-def encrypt_caesar(plaintext: str, shift: int = 3) -> str:
+def encrypt_caesar(
+    plaintext: str,
+    shift: int = 3,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
+) -> str:
     """
     Encrypts the given plaintext using the Caesar cipher technique.
     The Caesar cipher shifts each letter in the plaintext
     by a specified number of positions
-    down the alphabet. Non-alphabetic (only english)
-    characters are not affected.
+    down the alphabet. Characters out of the alphabets
+    (only english by default) are not affected.
 
     Args:
         plaintext (str): The text to be encrypted.
         shift (int, optional): The number of positions to shift each letter.
         Defaults to 3.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters to shift. Defaults to DEFAULT_ALPHABETS.
 
     Returns:
         str: The encrypted text.
@@ -60,32 +71,23 @@ def encrypt_caesar(plaintext: str, shift: int = 3) -> str:
         ''
     """
 
-    raw_ciphertext = []
-
-    for char in plaintext:
-        char_ord = ord(char)
-        start = get_start_ord(char_ord)
-
-        if start is not None:
-            encrypted_alpha = chr(
-                start + (char_ord - start + shift) % SIZE_OF_ALPHABET
-            )
-        else:
-            encrypted_alpha = char
-
-        raw_ciphertext.append(encrypted_alpha)
+    return plaintext.translate(shift_table(alphabets, shift))
 
-    return "".join(raw_ciphertext)
 
-
-def decrypt_caesar(ciphertext: str, shift: int = 3) -> str:
+def decrypt_caesar(
+    ciphertext: str,
+    shift: int = 3,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
+) -> str:
     """
     Decrypt a Caesar cipher text
-    (only for English letters, others will be ignored)
+    (only for letters of the alphabets, others will be ignored)
 
     Args:
         ciphertext (str): The text to be decrypted.
         shift (int): The shift used for decrypting, default is 3.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters to shift. Defaults to DEFAULT_ALPHABETS.
 
     Returns:
         str: The decrypted text.
@@ -101,7 +103,7 @@ def decrypt_caesar(ciphertext: str, shift: int = 3) -> str:
         ''
     """
 
-    return encrypt_caesar(ciphertext, shift=-shift)
+    return encrypt_caesar(ciphertext, shift=-shift, alphabets=alphabets)
 
 
 def caesar_breaker_brute_force(
@@ -150,6 +152,132 @@ def caesar_breaker_brute_force(
     return -1
 
 
+def _count_letters(message: str) -> list[int]:
+    """
+    Count English letters of the message (case-insensitive).
+
+    Examples:
+        >>> _count_letters("Abc, a!")[:4]
+        [2, 1, 1, 0]
+    """
+    lowered = message.lower()
+    return [lowered.count(letter) for letter in string.ascii_lowercase]
+
+
+def _break_caesar_batch(messages: list[str]) -> list[int]:
+    """
+    Find the most likely shift for every message of the batch.
+    Letter counts of the batch form a matrix which is multiplied
+    by SHIFT_WEIGHTS to score all shifts at once.
+
+    Args:
+        messages (list[str]): Batch of ciphertexts.
+
+    Returns:
+        list[int]: Shift for every message
+        (-1 for messages without English letters).
+    """
+    counts = [_count_letters(message) for message in messages]
+
+    if np is not None:
+        count_matrix = np.array(counts, dtype=float).reshape(-1, 26)
+        shifts = (count_matrix @ np.array(SHIFT_WEIGHTS)).argmax(axis=1)
+        has_letters = count_matrix.any(axis=1)
+        return np.where(has_letters, shifts, -1).tolist()
+
+    columns = list(zip(*SHIFT_WEIGHTS))
+    shifts = []
+    for row in counts:
+        if not any(row):
+            shifts.append(-1)
+            continue
+
+        scores = [sum(map(operator.mul, row, column)) for column in columns]
+        shifts.append(max(range(SIZE_OF_ALPHABET), key=scores.__getitem__))
+
+    return shifts
+
+
+def caesar_breaker_corpus(
+    messages: tp.Iterable[str],
+    batch_size: int = CORPUS_BATCH_SIZE,
+    workers: tp.Optional[int] = None,
+) -> tp.Iterator[tp.Tuple[int, int]]:
+    """
+    Breaks a corpus of Caesar ciphertexts by English letter frequencies.
+    Messages are read lazily in batches, every batch is scored for all
+    shifts with one matrix product (NumPy is used when available), and
+    batches are processed in a process pool.
+
+    Args:
+        messages (tp.Iterable[str]): Ciphertexts, e.g. an opened
+        newline-delimited file (trailing newlines are stripped).
+        batch_size (int, optional): Messages scored at once.
+        Defaults to CORPUS_BATCH_SIZE.
+        workers (tp.Optional[int], optional): Number of processes,
+        1 runs in the current process. Defaults to the number of CPUs.
+
+    Returns:
+        tp.Iterator[tp.Tuple[int, int]]: Index of the message and its
+        shift (-1 for messages without English letters), in input order.
+
+    Raises:
+        ValueError: If batch_size or workers is not positive.
+
+    Examples:
+        >>> list(caesar_breaker_corpus( \
+                [encrypt_caesar("Hello, how are you?", shift=6), "42"], \
+                workers=1, \
+            ))
+        [(0, 6), (1, -1)]
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    if workers is not None and workers <= 0:
+        raise ValueError("Number of workers must be positive")
+
+    return _break_caesar_corpus(
+        messages, batch_size, workers or multiprocessing.cpu_count()
+    )
+
+
+def _break_caesar_corpus(
+    messages: tp.Iterable[str], batch_size: int, workers: int
+) -> tp.Iterator[tp.Tuple[int, int]]:
+    """
+    Yield (index, shift) records for caesar_breaker_corpus.
+    """
+    stripped = (message.rstrip("\n") for message in messages)
+    batches = iter(lambda: list(itertools.islice(stripped, batch_size)), [])
+    index = 0
+
+    if workers == 1:
+        for batch in batches:
+            for shift in _break_caesar_batch(batch):
+                yield index, shift
+                index += 1
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep only a few batches in flight so huge corpora are not
+        # loaded into memory at once, results are yielded in order.
+        pending = collections.deque(
+            executor.submit(_break_caesar_batch, batch)
+            for batch in itertools.islice(batches, 2 * workers)
+        )
+
+        while pending:
+            shifts = pending.popleft().result()
+
+            batch = next(batches, None)
+            if batch is not None:
+                pending.append(executor.submit(_break_caesar_batch, batch))
+
+            for shift in shifts:
+                yield index, shift
+                index += 1
+
+
 if __name__ == "__main__":
 
     shifts = [randint(0, 24) for _ in range(9)] + [-1]
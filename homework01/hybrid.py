@@ -0,0 +1,350 @@
+import itertools
+import json
+import secrets
+import typing as tp
+
+import rsa
+from alphabet import (
+    DEFAULT_ALPHABETS,
+    Alphabet,
+    check_alphabets,
+    letter_index,
+)
+from caesar import encrypt_caesar
+from vigenere import encrypt_vigenere_stream
+
+HEADER_FORMAT = "rsa-hybrid"
+HEADER_VERSION = 1
+CIPHERS = ("vigenere", "caesar")
+SESSION_KEY_LENGTH = 32
+# rsa.encrypt works on code points, so blocks must be valid characters
+MAX_BLOCK = 0x110000
+PADDING_VALUES = 256
+
+
+def generate_session_key(
+    length: int = SESSION_KEY_LENGTH,
+    alphabet: Alphabet = DEFAULT_ALPHABETS[0],
+) -> str:
+    """
+    Generate a random key of lowercase letters of the alphabet.
+
+    Args:
+        length (int, optional): Number of letters in the key.
+        Defaults to SESSION_KEY_LENGTH.
+        alphabet (Alphabet, optional): Alphabet of the key letters.
+        Defaults to the first of DEFAULT_ALPHABETS.
+
+    Returns:
+        str: The session key.
+
+    Examples:
+        >>> key = generate_session_key(8)
+        >>> len(key), key.isalpha(), key.islower()
+        (8, True, True)
+    """
+    if length <= 0:
+        raise ValueError("Session key length must be positive")
+
+    return "".join(secrets.choice(alphabet.cases[0]) for _ in range(length))
+
+
+def _block_letters(size: int, n: int) -> int:
+    """
+    Number of key letters packed into one RSA block,
+    leaving room for PADDING_VALUES random paddings if possible.
+
+    Examples:
+        >>> _block_letters(26, 323), _block_letters(26, 11188147)
+        (1, 2)
+    """
+    if size < 2:
+        raise ValueError("Session key alphabet must have at least 2 letters")
+
+    capacity = min(n, MAX_BLOCK)
+    if capacity < size:
+        raise ValueError("RSA modulus is too small for the session key")
+
+    letters = 1
+    while size ** (letters + 1) * PADDING_VALUES <= capacity:
+        letters += 1
+
+    return letters
+
+
+def wrap_session_key(
+    public_key: tp.Tuple[int, int], indices: tp.List[int], size: int
+) -> tp.List[int]:
+    """
+    Pack letter indices of the session key into randomly padded integers
+    below the RSA modulus and encrypt them with rsa.encrypt.
+
+    Args:
+        public_key (tp.Tuple[int, int]): RSA key used to wrap the key.
+        indices (tp.List[int]): Letter indices of the session key.
+        size (int): Size of the alphabet of the session key.
+
+    Returns:
+        tp.List[int]: Wrapped blocks.
+    """
+    _, n = public_key
+    letters = _block_letters(size, n)
+    paddings = min(n, MAX_BLOCK) // size**letters
+    blocks = []
+
+    for i in range(0, len(indices), letters):
+        value = 0
+        for index in reversed(indices[i : i + letters]):
+            value = value * size + index
+        blocks.append(secrets.randbelow(paddings) * size**letters + value)
+
+    return rsa.encrypt(public_key, "".join(map(chr, blocks)))
+
+
+def unwrap_session_key(
+    private_key: tp.Tuple[int, int],
+    wrapped: tp.List[int],
+    size: int,
+    length: int,
+) -> tp.List[int]:
+    """
+    Decrypt blocks made by wrap_session_key and unpack letter indices.
+
+    Args:
+        private_key (tp.Tuple[int, int]): RSA key paired with the one
+        used for wrapping.
+        wrapped (tp.List[int]): Wrapped blocks.
+        size (int): Size of the alphabet of the session key.
+        length (int): Number of letters in the session key.
+
+    Returns:
+        tp.List[int]: Letter indices of the session key.
+
+    Raises:
+        ValueError: If the blocks can not be unwrapped with the key.
+
+    Examples:
+        >>> public, private = ((9678731, 11188147), (1804547, 11188147))
+        >>> wrapped = wrap_session_key(public, [7, 4, 11, 11, 14], 26)
+        >>> unwrap_session_key(private, wrapped, 26, 5)
+        [7, 4, 11, 11, 14]
+    """
+    error = "Session key can not be unwrapped with this key"
+    _, n = private_key
+    letters = _block_letters(size, n)
+    if len(wrapped) != -(-length // letters):
+        raise ValueError(error)
+
+    try:
+        blocks = map(ord, rsa.decrypt(private_key, wrapped))
+    except (ValueError, OverflowError) as e:
+        raise ValueError(error) from e
+
+    indices = []
+    for block in blocks:
+        value = block % size**letters
+        for _ in range(letters):
+            indices.append(value % size)
+            value //= size
+
+    return indices[:length]
+
+
+def encrypt_hybrid(
+    public_key: tp.Tuple[int, int],
+    chunks: tp.Iterable[str],
+    cipher: str = "vigenere",
+    key_length: int = SESSION_KEY_LENGTH,
+    ignore_space: bool = False,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
+) -> tp.Iterator[str]:
+    """
+    Encrypt a text with a random session key of the symmetric cipher
+    and wrap only the session key with RSA. The first yielded chunk
+    is the container header: one JSON line with everything needed
+    for decryption except the private key.
+
+    The wrap is textbook RSA from rsa.py: letters of the key are packed
+    into randomly padded blocks, so the key can not be read from a table
+    of encrypted letters, but with the small keys of
+    rsa.generate_keypair every block can be brute-forced with the public
+    key alone. It offers no real confidentiality.
+
+    Args:
+        public_key (tp.Tuple[int, int]): RSA key used to wrap the session
+        key, its modulus must not be less than the size of the alphabet.
+        chunks (tp.Iterable[str]): Parts of the plaintext,
+        e.g. an opened text file.
+        cipher (str, optional): Symmetric cipher, one of CIPHERS.
+        Defaults to "vigenere".
+        key_length (int, optional): Number of letters in the session key
+        (Caesar uses one letter). Defaults to SESSION_KEY_LENGTH.
+        ignore_space (bool, optional): If True,
+        characters out of the alphabets will be ignored in indexing.
+        Defaults to False.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters to shift. Defaults to DEFAULT_ALPHABETS.
+
+    Returns:
+        tp.Iterator[str]: The header line, then encrypted chunks.
+
+    Raises:
+        ValueError: If the cipher is unknown, the alphabets can not be
+        used together or the RSA modulus is too small.
+
+    Examples:
+        >>> public, private = ((121, 323), (169, 323))
+        >>> container = "".join(encrypt_hybrid(public, ["Hello, world!"]))
+        >>> "".join(decrypt_hybrid(private, [container]))
+        'Hello, world!'
+    """
+    if cipher not in CIPHERS:
+        raise ValueError(f"Unknown cipher {cipher}")
+    check_alphabets(alphabets)
+
+    if cipher == "caesar":
+        # The first letter is shift 0, which leaves the payload as is
+        session_key = secrets.choice(alphabets[0].cases[0][1:])
+    else:
+        session_key = generate_session_key(key_length, alphabets[0])
+    indices = [letter_index(char, alphabets) for char in session_key]
+    wrapped = wrap_session_key(public_key, indices, alphabets[0].size)
+
+    header = {
+        "format": HEADER_FORMAT,
+        "version": HEADER_VERSION,
+        "cipher": cipher,
+        "ignore_space": ignore_space,
+        "alphabets": [alphabet.cases for alphabet in alphabets],
+        "key_length": len(session_key),
+        "key": wrapped,
+    }
+    header_line = json.dumps(header, ensure_ascii=False) + "\n"
+
+    return itertools.chain(
+        [header_line],
+        _cipher_chunks(
+            chunks, session_key, cipher, False, ignore_space, alphabets
+        ),
+    )
+
+
+def _cipher_chunks(
+    chunks: tp.Iterable[str],
+    session_key: str,
+    cipher: str,
+    decrypt: bool,
+    ignore_space: bool,
+    alphabets: tp.Tuple[Alphabet, ...],
+) -> tp.Iterator[str]:
+    """
+    Encrypt or decrypt chunks of the payload with the session key.
+    """
+    if cipher == "caesar":
+        shift = letter_index(session_key, alphabets)
+        if decrypt:
+            shift = -shift
+        for chunk in chunks:
+            yield encrypt_caesar(chunk, shift, alphabets)
+    else:
+        yield from encrypt_vigenere_stream(
+            chunks, session_key, decrypt, ignore_space, alphabets
+        )
+
+
+def _is_int(value: tp.Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_header(header: dict) -> None:
+    """
+    Check types of the container header fields.
+
+    Raises:
+        ValueError: If a field is missing or has a wrong type.
+    """
+    alphabets = header.get("alphabets")
+    key = header.get("key")
+    key_length = header.get("key_length")
+
+    if not (
+        isinstance(alphabets, list)
+        and alphabets
+        and all(
+            isinstance(cases, list)
+            and 1 <= len(cases) <= 2
+            and all(isinstance(case, str) for case in cases)
+            for cases in alphabets
+        )
+    ):
+        raise ValueError("Container header has invalid alphabets")
+    if not (isinstance(key, list) and all(map(_is_int, key))):
+        raise ValueError("Container header has invalid key")
+    if not (_is_int(key_length) and key_length > 0):
+        raise ValueError("Container header has invalid key_length")
+    if not isinstance(header.get("ignore_space"), bool):
+        raise ValueError("Container header has invalid ignore_space")
+
+
+def decrypt_hybrid(
+    private_key: tp.Tuple[int, int], chunks: tp.Iterable[str]
+) -> tp.Iterator[str]:
+    """
+    Decrypt a container made by encrypt_hybrid: read the header,
+    unwrap the session key with RSA and decrypt the payload.
+    The header is read and checked right away, the payload lazily.
+
+    Args:
+        private_key (tp.Tuple[int, int]): RSA key paired with the one
+        used for encryption.
+        chunks (tp.Iterable[str]): Parts of the container,
+        e.g. an opened text file.
+
+    Returns:
+        tp.Iterator[str]: Decrypted chunks.
+
+    Raises:
+        ValueError: If the container header is missing, not supported
+        or has invalid fields, or the session key can not be unwrapped
+        with the private key.
+    """
+    chunks = iter(chunks)
+    buffer = ""
+
+    while "\n" not in buffer:
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError("Container header is missing")
+        buffer += chunk
+
+    header_line, payload = buffer.split("\n", 1)
+    try:
+        header = json.loads(header_line)
+    except json.JSONDecodeError as e:
+        raise ValueError("Container header is not valid JSON") from e
+
+    if (
+        not isinstance(header, dict)
+        or header.get("format") != HEADER_FORMAT
+        or header.get("version") != HEADER_VERSION
+        or header.get("cipher") not in CIPHERS
+    ):
+        raise ValueError("Container format is not supported")
+    _check_header(header)
+
+    alphabets = tuple(Alphabet(*cases) for cases in header["alphabets"])
+    check_alphabets(alphabets)
+    key_letters = alphabets[0].cases[0]
+    indices = unwrap_session_key(
+        private_key, header["key"], len(key_letters), header["key_length"]
+    )
+    session_key = "".join(key_letters[index] for index in indices)
+
+    return _cipher_chunks(
+        itertools.chain([payload] if payload else [], chunks),
+        session_key,
+        header["cipher"],
+        True,
+        header["ignore_space"],
+        alphabets,
+    )
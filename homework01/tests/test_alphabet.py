@@ -0,0 +1,71 @@
+import unittest
+
+import alphabet
+
+
+class AlphabetTestCase(unittest.TestCase):
+    def test_tables(self):
+        greek = alphabet.Alphabet("αβγ", "ΑΒΓ")
+        self.assertEqual(3, greek.size)
+        self.assertEqual(["αβγ", "ΑΒΓ"], greek.cases)
+        self.assertEqual(1, greek.indices[ord("β")])
+        self.assertEqual(2, greek.indices[ord("Γ")])
+        self.assertNotIn(ord("a"), greek.indices)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            alphabet.Alphabet("")
+        with self.assertRaises(ValueError):
+            alphabet.Alphabet("abc", "AB")
+        with self.assertRaises(ValueError):
+            alphabet.Alphabet("aba")
+
+    def test_shift_table(self):
+        alphabets = (alphabet.ENGLISH, alphabet.CYRILLIC)
+        cases = [
+            ("", 1, ""),
+            ("Abz, Эюя!", 0, "Abz, Эюя!"),
+            ("Abz, Эюя!", 1, "Bca, Юяа!"),
+            ("Abz, Эюя!", -1, "Zay, Ьэю!"),
+            ("Ёлка", 33, "Ёлка"),
+        ]
+
+        for i, (text, shift, shifted) in enumerate(cases):
+            with self.subTest(case=i, text=text, shift=shift):
+                self.assertEqual(
+                    shifted,
+                    text.translate(alphabet.shift_table(alphabets, shift)),
+                )
+
+    def test_letter_index(self):
+        alphabets = (alphabet.ENGLISH, alphabet.CYRILLIC)
+        self.assertEqual(0, alphabet.letter_index("a", alphabets))
+        self.assertEqual(25, alphabet.letter_index("Z", alphabets))
+        self.assertEqual(32, alphabet.letter_index("Я", alphabets))
+        self.assertIsNone(alphabet.letter_index("1", alphabets))
+        self.assertIsNone(
+            alphabet.letter_index("я", alphabet.DEFAULT_ALPHABETS)
+        )
+
+    def test_overlapping(self):
+        alphabets = (alphabet.ENGLISH, alphabet.Alphabet("abc"))
+
+        with self.assertRaises(ValueError):
+            alphabet.check_alphabets(alphabets)
+        with self.assertRaises(ValueError):
+            alphabet.check_alphabets(())
+        with self.assertRaises(ValueError):
+            alphabet.shift_table(alphabets, 1)
+        with self.assertRaises(ValueError):
+            alphabet.letter_index("a", alphabets)
+        with self.assertRaises(ValueError):
+            alphabet.letter_runs(alphabets)
+
+    def test_cache_limit(self):
+        for i in range(1100):
+            alphabets = (alphabet.Alphabet(chr(0x4E00 + i) + "ab"),)
+            alphabet.letter_runs(alphabets)
+
+        for cached in (alphabet.check_alphabets, alphabet.letter_runs):
+            with self.subTest(cached=cached.__name__):
+                self.assertLessEqual(cached.cache_info().currsize, 1024)
@@ -1,7 +1,9 @@
 import random
 import string
 import unittest
+from unittest import mock
 
+import alphabet
 import caesar
 
 
@@ -61,3 +63,58 @@ class CaesarTestCase(unittest.TestCase):
             caesar.decrypt_caesar(ciphertext, shift=shift),
             msg=f"shift={shift}, ciphertext={ciphertext}",
         )
+
+    def check_breaker_corpus(self, workers):
+        plaintexts = [
+            "Hello, how are you?",
+            "The quick brown fox jumps over the lazy dog",
+            "Python is a programming language",
+            "",
+            "3.14",
+        ]
+        shifts = [6, 0, 17, -1, -1]
+        messages = [
+            caesar.encrypt_caesar(plaintext, shift=max(shift, 0)) + "\n"
+            for plaintext, shift in zip(plaintexts, shifts)
+        ]
+
+        self.assertEqual(
+            list(enumerate(shifts)),
+            list(
+                caesar.caesar_breaker_corpus(
+                    iter(messages), batch_size=2, workers=workers
+                )
+            ),
+        )
+
+    def test_breaker_corpus(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.check_breaker_corpus(workers)
+
+    def test_breaker_corpus_fallback(self):
+        with mock.patch.object(caesar, "np", None):
+            self.check_breaker_corpus(1)
+
+    @unittest.skipIf(caesar.np is None, "NumPy is not installed")
+    def test_breaker_corpus_numpy(self):
+        self.check_breaker_corpus(1)
+
+    def test_breaker_corpus_invalid(self):
+        for kwargs in [{"batch_size": 0}, {"workers": 0}, {"workers": -1}]:
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    caesar.caesar_breaker_corpus(["abc"], **kwargs)
+
+    def test_alphabets(self):
+        alphabets = (alphabet.ENGLISH, alphabet.CYRILLIC)
+        plaintext = "Python и Питон, 3.6"
+        ciphertext = caesar.encrypt_caesar(plaintext, 3, alphabets)
+
+        self.assertEqual("Sbwkrq л Тлхср, 3.6", ciphertext)
+        self.assertEqual(
+            plaintext, caesar.decrypt_caesar(ciphertext, 3, alphabets)
+        )
+        self.assertEqual(
+            "Sbwkrq и Питон, 3.6", caesar.encrypt_caesar(plaintext, 3)
+        )
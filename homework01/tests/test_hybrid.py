@@ -0,0 +1,151 @@
+import io
+import json
+import random
+import string
+import unittest
+
+import alphabet
+import hybrid
+import vigenere
+
+
+class HybridTestCase(unittest.TestCase):
+    public, private = ((9678731, 11188147), (1804547, 11188147))
+
+    def test_roundtrip(self):
+        plaintext = "".join(
+            random.choice(string.ascii_letters + " -,\n") for _ in range(500)
+        )
+
+        for cipher in hybrid.CIPHERS:
+            for ignore_space in (False, True):
+                with self.subTest(cipher=cipher, ignore_space=ignore_space):
+                    container = "".join(
+                        hybrid.encrypt_hybrid(
+                            self.public,
+                            io.StringIO(plaintext),
+                            cipher=cipher,
+                            ignore_space=ignore_space,
+                        )
+                    )
+                    self.assertNotIn(plaintext, container)
+
+                    chunks = [
+                        container[i : i + 7]
+                        for i in range(0, len(container), 7)
+                    ]
+                    self.assertEqual(
+                        plaintext,
+                        "".join(hybrid.decrypt_hybrid(self.private, chunks)),
+                    )
+
+    def test_alphabets(self):
+        alphabets = (alphabet.CYRILLIC, alphabet.ENGLISH)
+        plaintext = "Привет, world!"
+        container = "".join(
+            hybrid.encrypt_hybrid(
+                self.public, [plaintext], key_length=4, alphabets=alphabets
+            )
+        )
+
+        self.assertEqual(
+            plaintext,
+            "".join(hybrid.decrypt_hybrid(self.private, [container])),
+        )
+
+    def test_caesar_shift(self):
+        for _ in range(100):
+            container = "".join(
+                hybrid.encrypt_hybrid(self.public, ["abc"], cipher="caesar")
+            )
+            self.assertNotEqual("abc", container.split("\n", 1)[1])
+
+    def test_invalid_arguments(self):
+        cases = [
+            ((3, 15), {}),
+            (self.public, {"alphabets": (alphabet.Alphabet("a"),)}),
+            (self.public, {"cipher": "bogus"}),
+            (
+                self.public,
+                {"alphabets": (alphabet.ENGLISH, alphabet.Alphabet("abc"))},
+            ),
+        ]
+
+        for i, (public, kwargs) in enumerate(cases):
+            with self.subTest(case=i):
+                with self.assertRaises(ValueError):
+                    hybrid.encrypt_hybrid(public, ["secret"], **kwargs)
+
+    def test_session_key_wrapping(self):
+        indices = [random.randrange(26) for _ in range(32)]
+
+        for public, private in [
+            ((121, 323), (169, 323)),
+            (self.public, self.private),
+        ]:
+            with self.subTest(public=public):
+                wrapped = hybrid.wrap_session_key(public, indices, 26)
+                self.assertNotEqual(
+                    wrapped, hybrid.wrap_session_key(public, indices, 26)
+                )
+                self.assertEqual(
+                    indices,
+                    hybrid.unwrap_session_key(private, wrapped, 26, 32),
+                )
+
+    def test_invalid_container(self):
+        cases = [
+            [],
+            ["no header"],
+            ["not json\npayload"],
+            ['{"format": "other"}\npayload'],
+        ]
+
+        container = "".join(hybrid.encrypt_hybrid(self.public, ["secret"]))
+        header_line, payload = container.split("\n", 1)
+        invalid_fields = [
+            {"alphabets": None},
+            {"alphabets": []},
+            {"alphabets": "abc"},
+            {"alphabets": [["abc", "ABC", "abc"]]},
+            {"alphabets": [[1, 2]]},
+            {"alphabets": [["aab"]]},
+            {"alphabets": [["a", "A"]]},
+            {"alphabets": [["abc"], ["cde"]]},
+            {"key": None},
+            {"key": 42},
+            {"key": ["42"]},
+            {"key": [True]},
+            {"key": []},
+            {"key_length": None},
+            {"key_length": 0},
+            {"ignore_space": None},
+            {"ignore_space": "yes"},
+        ]
+        for fields in invalid_fields:
+            header = {**json.loads(header_line), **fields}
+            for name, value in fields.items():
+                if value is None:
+                    del header[name]
+            cases.append([json.dumps(header) + "\n" + payload])
+
+        for i, chunks in enumerate(cases):
+            with self.subTest(case=i):
+                with self.assertRaises(ValueError):
+                    hybrid.decrypt_hybrid(self.private, chunks)
+
+    def test_header(self):
+        container = "".join(hybrid.encrypt_hybrid(self.public, ["secret"]))
+        header_line, payload = container.split("\n", 1)
+        header = json.loads(header_line)
+
+        self.assertEqual(hybrid.HEADER_FORMAT, header["format"])
+        self.assertEqual("vigenere", header["cipher"])
+        self.assertEqual(hybrid.SESSION_KEY_LENGTH, header["key_length"])
+        indices = hybrid.unwrap_session_key(
+            self.private, header["key"], 26, header["key_length"]
+        )
+        session_key = "".join(string.ascii_lowercase[i] for i in indices)
+        self.assertEqual(
+            "secret", vigenere.decrypt_vigenere(payload, session_key)
+        )
@@ -1,7 +1,12 @@
+import io
+import os
 import random
 import string
+import tempfile
 import unittest
+from unittest import mock
 
+import alphabet
 import vigenere
 
 
@@ -56,3 +61,246 @@ class VigenereTestCase(unittest.TestCase):
         self.assertEqual(
             plaintext, vigenere.decrypt_vigenere(ciphertext, keyword)
         )
+
+    def test_decrypt_range(self):
+        plaintext = "".join(
+            random.choice(string.ascii_letters + " -,") for _ in range(300)
+        )
+        keyword = "lemon"
+
+        for ignore_space in (False, True):
+            ciphertext = vigenere.encrypt_vigenere(
+                plaintext, keyword, ignore_space=ignore_space
+            )
+            text_index = vigenere.build_index(
+                ciphertext, step=16, ignore_space=ignore_space
+            )
+            file_index = vigenere.build_index(
+                io.StringIO(ciphertext), step=16, ignore_space=ignore_space
+            )
+
+            ranges = [(0, 0), (0, 300), (5, 40), (32, 48), (290, 300)]
+            for start, end in ranges:
+                with self.subTest(
+                    ignore_space=ignore_space, start=start, end=end
+                ):
+                    self.assertEqual(
+                        plaintext[start:end],
+                        vigenere.decrypt_range(
+                            ciphertext, keyword, start, end, text_index
+                        ),
+                    )
+                    self.assertEqual(
+                        plaintext[start:end],
+                        vigenere.decrypt_range(
+                            io.StringIO(ciphertext),
+                            keyword,
+                            start,
+                            end,
+                            file_index,
+                        ),
+                    )
+
+    def test_index_sidecar(self):
+        index = vigenere.build_index("ab cd ef", step=3, ignore_space=True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cipher.idx")
+            vigenere.save_index(index, path)
+            self.assertEqual(index, vigenere.load_index(path))
+
+    def test_index_file(self):
+        alphabets = (alphabet.ENGLISH, alphabet.CYRILLIC)
+        plaintext = "Attack в Атаку, at dawn!\n" * 20
+        ciphertext = vigenere.encrypt_vigenere(
+            plaintext, "лимон", ignore_space=True, alphabets=alphabets
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            cipher_path = os.path.join(directory, "cipher.txt")
+            index_path = os.path.join(directory, "cipher.idx")
+            with open(cipher_path, "w", encoding="utf-8") as file:
+                file.write(ciphertext)
+
+            with open(cipher_path, encoding="utf-8") as file:
+                index = vigenere.build_index(
+                    file, step=16, ignore_space=True, alphabets=alphabets
+                )
+            vigenere.save_index(index, index_path)
+            index = vigenere.load_index(index_path)
+
+            with open(cipher_path, encoding="utf-8") as file:
+                for start, end in [(0, 10), (37, 120), (300, 500)]:
+                    with self.subTest(start=start, end=end):
+                        self.assertEqual(
+                            plaintext[start:end],
+                            vigenere.decrypt_range(
+                                file, "лимон", start, end, index
+                            ),
+                        )
+
+            with self.assertRaises(ValueError):
+                vigenere.decrypt_range(ciphertext, "лимон", 0, 10, index)
+
+        text_index = vigenere.build_index(ciphertext, alphabets=alphabets)
+        with self.assertRaises(ValueError):
+            vigenere.decrypt_range(
+                io.StringIO(ciphertext), "лимон", 0, 10, text_index
+            )
+
+    def test_index_alphabets(self):
+        alphabets = (alphabet.ENGLISH, alphabet.CYRILLIC)
+        plaintext = "Attack в Атаку, at dawn!" * 5
+        ciphertext = vigenere.encrypt_vigenere(
+            plaintext, "лимон", ignore_space=True, alphabets=alphabets
+        )
+        index = vigenere.build_index(
+            ciphertext, step=8, ignore_space=True, alphabets=alphabets
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cipher.idx")
+            vigenere.save_index(index, path)
+            index = vigenere.load_index(path)
+
+        self.assertEqual(
+            plaintext[30:70],
+            vigenere.decrypt_range(ciphertext, "лимон", 30, 70, index),
+        )
+
+    def test_breaker_dictionary(self):
+        dictionary = {"introduction", "to", "python"}
+        ciphertext = vigenere.encrypt_vigenere(
+            "introduction to python", "lsci"
+        )
+        candidates = ["lemon", "a", "l1ci", "lsc", "lsci\n", "python"]
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(
+                    "lsci",
+                    vigenere.vigenere_breaker_dictionary(
+                        ciphertext,
+                        iter(candidates),
+                        dictionary,
+                        workers=workers,
+                        batch_size=2,
+                    ),
+                )
+                self.assertIsNone(
+                    vigenere.vigenere_breaker_dictionary(
+                        ciphertext,
+                        candidates[:4],
+                        dictionary,
+                        workers=workers,
+                        batch_size=2,
+                    )
+                )
+
+    def test_breaker_dictionary_prefix(self):
+        dictionary = {"hello", "how", "are", "you"}
+        ciphertext = vigenere.encrypt_vigenere(
+            "hello how are you " * 10, "key"
+        )
+
+        for prefix_length, threshold in [(60, 1.0), (62, 1.0), (8, 0.9)]:
+            with self.subTest(prefix_length=prefix_length):
+                self.assertEqual(
+                    "key",
+                    vigenere.vigenere_breaker_dictionary(
+                        ciphertext,
+                        ["lemon", "key"],
+                        dictionary,
+                        threshold=threshold,
+                        workers=1,
+                        prefix_length=prefix_length,
+                    ),
+                )
+
+    def test_breaker_dictionary_alphabets(self):
+        alphabets = (alphabet.CYRILLIC, alphabet.ENGLISH)
+        ciphertext = vigenere.encrypt_vigenere(
+            "привет как дела", "ключ", alphabets=alphabets
+        )
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(
+                    "ключ",
+                    vigenere.vigenere_breaker_dictionary(
+                        ciphertext,
+                        ["лимон", "key", "ключ"],
+                        {"привет", "как", "дела"},
+                        workers=workers,
+                        alphabets=alphabets,
+                    ),
+                )
+
+    def test_breaker_dictionary_in_process(self):
+        ciphertext = vigenere.encrypt_vigenere("hello how are you", "key")
+
+        with mock.patch.object(
+            vigenere.multiprocessing, "cpu_count", return_value=1
+        ), mock.patch.object(
+            vigenere, "ProcessPoolExecutor", side_effect=AssertionError
+        ):
+            self.assertEqual(
+                "key",
+                vigenere.vigenere_breaker_dictionary(
+                    ciphertext, ["lemon", "key"], {"hello", "how", "are"}
+                ),
+            )
+        self.assertEqual({}, vigenere._attack_state)
+
+    def test_breaker_dictionary_invalid(self):
+        for kwargs in [{"batch_size": 0}, {"workers": 0}, {"workers": -1}]:
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    vigenere.vigenere_breaker_dictionary(
+                        "abc", ["a"], {"abc"}, **kwargs
+                    )
+
+    def test_alphabets(self):
+        alphabets = (alphabet.ENGLISH, alphabet.CYRILLIC)
+        plaintext = "Attack в Атаку, at dawn!"
+
+        for ignore_space in (False, True):
+            with self.subTest(ignore_space=ignore_space):
+                ciphertext = vigenere.encrypt_vigenere(
+                    plaintext,
+                    "лимон",
+                    ignore_space=ignore_space,
+                    alphabets=alphabets,
+                )
+                self.assertNotIn("Атаку", ciphertext)
+                self.assertEqual(
+                    plaintext,
+                    vigenere.decrypt_vigenere(
+                        ciphertext,
+                        "лимон",
+                        ignore_space=ignore_space,
+                        alphabets=alphabets,
+                    ),
+                )
+
+        self.assertEqual(
+            "ЛЙОС",
+            vigenere.encrypt_vigenere("АБВГ", "лимон", alphabets=alphabets),
+        )
+
+    def test_stream(self):
+        plaintext = "introduction to python"
+        chunks = [plaintext[i : i + 5] for i in range(0, len(plaintext), 5)]
+
+        for ignore_space in (False, True):
+            with self.subTest(ignore_space=ignore_space):
+                self.assertEqual(
+                    vigenere.encrypt_vigenere(
+                        plaintext, "lsci", ignore_space=ignore_space
+                    ),
+                    "".join(
+                        vigenere.encrypt_vigenere_stream(
+                            chunks, "lsci", ignore_space=ignore_space
+                        )
+                    ),
+                )
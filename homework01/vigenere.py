@@ -1,14 +1,68 @@
-from caesar import SIZE_OF_ALPHABET, get_start_ord
+import itertools
+import json
+import multiprocessing
+import typing as tp
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from alphabet import (
+    DEFAULT_ALPHABETS,
+    Alphabet,
+    letter_index,
+    letter_runs,
+    shift_table,
+)
 from testing import test
 
+DEFAULT_INDEX_STEP = 4096
+ATTACK_PREFIX_LENGTH = 64
+ATTACK_BATCH_SIZE = 10000
 
-def decrypt_key(key: str) -> list[int]:
+_attack_state: dict = {}
+
+
+class VigenereIndex(tp.NamedTuple):
+    """
+    Checkpoint index for random-access decryption.
+
+    Attributes:
+        step (int): Number of characters between two checkpoints.
+        ignore_space (bool): Indexing mode the ciphertext was made with.
+        key_positions (list[int]): Key position at every checkpoint
+        (checkpoint k starts at character k * step).
+        offsets (list[int]): Position to seek to for every checkpoint
+        (character offset for strings, tell() value for files).
+        alphabets (list[list[str]]): Cases of every alphabet
+        the ciphertext was made with.
+        source (str): Kind of the indexed source, "text" for strings
+        or "file" for files, as offsets of the kinds are not compatible.
+    """
+
+    step: int
+    ignore_space: bool
+    key_positions: list[int]
+    offsets: list[int]
+    alphabets: list[list[str]]
+    source: str
+
+
+def _source_kind(ciphertext_source: tp.Union[str, tp.TextIO]) -> str:
+    """
+    Kind of the ciphertext source stored in VigenereIndex.
+    """
+    return "text" if isinstance(ciphertext_source, str) else "file"
+
+
+def decrypt_key(
+    key: str, alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS
+) -> list[int]:
     """
     Generate a list of integer shifts from a given key for the Vigenere cipher.
 
     Args:
         key (str): The key used for encryption/decryption,
-        consisting only of English letters.
+        consisting only of letters of the alphabets.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the key letters. Defaults to DEFAULT_ALPHABETS.
 
     Returns:
         list[int]: A list of integer shifts
@@ -16,7 +70,7 @@ def decrypt_key(key: str) -> list[int]:
 
     Raises:
         ValueError: If the key contains characters that are not
-        English letters.
+        letters of the alphabets.
 
     Example:
         >>> decrypt_key("ABC")
@@ -26,26 +80,29 @@ def decrypt_key(key: str) -> list[int]:
         >>> decrypt_key("A1C")
         Traceback (most recent call last):
             ...
-        ValueError: Char 1 is not English letter
+        ValueError: Char 1 is not a letter of the alphabets
     """
     assert key and key.isalpha()
 
     int_key = []
 
     for char in key:
-        char_ord = ord(char)
-        start = get_start_ord(char_ord)
+        index = letter_index(char, alphabets)
 
-        if start is not None:
-            int_key.append(char_ord - start)
+        if index is not None:
+            int_key.append(index)
         else:
-            raise ValueError(f"Char {char} is not English letter")
+            raise ValueError(f"Char {char} is not a letter of the alphabets")
 
     return int_key
 
 
 def encrypt_vigenere(
-    plaintext: str, key: str, decrypt: bool = False, ignore_space: bool = False
+    plaintext: str,
+    key: str,
+    decrypt: bool = False,
+    ignore_space: bool = False,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
 ) -> str:
     """
     Apply a Vigenere cipher to the given text.
@@ -59,7 +116,10 @@ def encrypt_vigenere(
         the function will decrypt the plaintext.
         Defaults to False.
         ignore_space (bool, optional): If True,
-        non-English letters will be ignored in indexing. Defaults to False.
+        characters out of the alphabets will be ignored in indexing.
+        Defaults to False.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters to shift. Defaults to DEFAULT_ALPHABETS.
 
     Returns:
         str: The resulting encrypted or decrypted text.
@@ -69,39 +129,91 @@ def encrypt_vigenere(
         'ATTACKATDAWN'
     """
 
-    raw_ciphertext = []
-    int_key = decrypt_key(key)
-    key_size = len(int_key)
-    index_shift = 0
+    int_key = decrypt_key(key, alphabets)
 
     if decrypt:
         int_key = [-i for i in int_key]
 
-    i = 0
-    for char in plaintext:
-        char_ord = ord(char)
-        start = get_start_ord(char_ord)
+    return _shift_text(plaintext, int_key, ignore_space, alphabets=alphabets)
 
-        if start is not None:
-            shift = int_key[(i - index_shift) % key_size]
-            encrypted_alpha = chr(
-                start + (char_ord - start + shift) % SIZE_OF_ALPHABET
-            )
 
-            i += 1
-        else:
-            encrypted_alpha = char
+def _shift_text(
+    text: str,
+    int_key: list[int],
+    ignore_space: bool,
+    position: int = 0,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
+) -> str:
+    """
+    Shift every letter of the text by the key,
+    starting from the given key position.
+
+    Args:
+        text (str): The text to be shifted.
+        int_key (list[int]): Shifts produced by decrypt_key
+        (negated for decryption).
+        ignore_space (bool): If True,
+        characters out of the alphabets will be ignored in indexing.
+        position (int, optional): Key position of the first character.
+        Defaults to 0.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters to shift. Defaults to DEFAULT_ALPHABETS.
+
+    Returns:
+        str: The shifted text.
+    """
+    tables = [shift_table(alphabets, shift) for shift in int_key]
+
+    if not ignore_space:
+        return _shift_stride(text, tables, position)
+
+    # Odd parts are runs of letters, shift them as one string
+    # and put back in place of the original runs.
+    parts = letter_runs(alphabets).split(text)
+    letters = _shift_stride("".join(parts[1::2]), tables, position)
+
+    offset = 0
+    for i in range(1, len(parts), 2):
+        run_size = len(parts[i])
+        parts[i] = letters[offset : offset + run_size]
+        offset += run_size
 
-            if ignore_space is False:
-                i += 1
+    return "".join(parts)
 
-        raw_ciphertext.append(encrypted_alpha)
 
-    return "".join(raw_ciphertext)
+def _shift_stride(text: str, tables: list[dict], position: int) -> str:
+    """
+    Translate every key_size-th character of the text with the same
+    table, so the cipher runs as key_size str.translate calls.
+
+    Args:
+        text (str): The text to be shifted.
+        tables (list[dict]): Translation table for every key position.
+        position (int): Key position of the first character.
+
+    Returns:
+        str: The shifted text.
+
+    Examples:
+        >>> _shift_stride("aaaa", [shift_table(DEFAULT_ALPHABETS, 0), \
+shift_table(DEFAULT_ALPHABETS, 1)], 1)
+        'baba'
+    """
+    key_size = len(tables)
+    shifted = list(text)
+
+    for i in range(min(key_size, len(text))):
+        table = tables[(position + i) % key_size]
+        shifted[i::key_size] = text[i::key_size].translate(table)
+
+    return "".join(shifted)
 
 
 def decrypt_vigenere(
-    plaintext: str, key: str, ignore_space: bool = False
+    plaintext: str,
+    key: str,
+    ignore_space: bool = False,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
 ) -> str:
     """
     Decrypt a Vigenere cipher to text.
@@ -112,7 +224,10 @@ def decrypt_vigenere(
         key (str): The key used for the Vigenere cipher.
         It should be a string of letters.
         ignore_space (bool, optional): If True,
-        non-English letters will be ignored in indexing. Defaults to False.
+        characters out of the alphabets will be ignored in indexing.
+        Defaults to False.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters to shift. Defaults to DEFAULT_ALPHABETS.
 
     Returns:
         str: The decrypted text.
@@ -126,7 +241,442 @@ def decrypt_vigenere(
         'ATTACKATDAWN'
     """
 
-    return encrypt_vigenere(plaintext, key, True, ignore_space)
+    return encrypt_vigenere(plaintext, key, True, ignore_space, alphabets)
+
+
+def encrypt_vigenere_stream(
+    chunks: tp.Iterable[str],
+    key: str,
+    decrypt: bool = False,
+    ignore_space: bool = False,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
+) -> tp.Iterator[str]:
+    """
+    Apply a Vigenere cipher to a text given by chunks,
+    keeping the key position between them.
+
+    Args:
+        chunks (tp.Iterable[str]): Parts of the text,
+        e.g. an opened text file.
+        key (str): The key used for the Vigenere cipher.
+        It should be a string of letters.
+        decrypt (bool, optional): If True,
+        the function will decrypt the chunks.
+        Defaults to False.
+        ignore_space (bool, optional): If True,
+        characters out of the alphabets will be ignored in indexing.
+        Defaults to False.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters to shift. Defaults to DEFAULT_ALPHABETS.
+
+    Yields:
+        str: Encrypted or decrypted chunks.
+
+    Examples:
+        >>> list(encrypt_vigenere_stream(["ATTACK", "ATDAWN"], "LEMON"))
+        ['LXFOPV', 'EFRNHR']
+    """
+    int_key = decrypt_key(key, alphabets)
+    letters = letter_runs(alphabets)
+    position = 0
+
+    if decrypt:
+        int_key = [-i for i in int_key]
+
+    for chunk in chunks:
+        yield _shift_text(chunk, int_key, ignore_space, position, alphabets)
+
+        if ignore_space:
+            position += sum(map(len, letters.findall(chunk)))
+        else:
+            position += len(chunk)
+
+
+def build_index(
+    ciphertext_source: tp.Union[str, tp.TextIO],
+    step: int = DEFAULT_INDEX_STEP,
+    ignore_space: bool = False,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
+) -> VigenereIndex:
+    """
+    Build a checkpoint index of a ciphertext in one streaming pass.
+    The index does not depend on the key, only on the letters positions.
+
+    Args:
+        ciphertext_source (tp.Union[str, tp.TextIO]): The ciphertext
+        or a text file opened for reading.
+        step (int, optional): Number of characters between checkpoints.
+        Defaults to DEFAULT_INDEX_STEP.
+        ignore_space (bool, optional): If True,
+        characters out of the alphabets will be ignored in indexing.
+        Defaults to False.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters. Defaults to DEFAULT_ALPHABETS.
+
+    Returns:
+        VigenereIndex: The checkpoint index.
+
+    Examples:
+        >>> index = build_index("ab cd ef", step=3, ignore_space=True)
+        >>> index.key_positions, index.offsets
+        ([0, 2, 4], [0, 3, 6])
+    """
+    if step <= 0:
+        raise ValueError("Step must be positive")
+
+    source = _source_kind(ciphertext_source)
+    is_text = source == "text"
+    letters = letter_runs(alphabets)
+    key_positions = [0]
+    offsets = [0 if is_text else ciphertext_source.tell()]
+    position = 0
+    char_offset = 0
+
+    while True:
+        if is_text:
+            chunk = ciphertext_source[char_offset : char_offset + step]
+        else:
+            chunk = ciphertext_source.read(step)
+
+        if ignore_space:
+            position += sum(map(len, letters.findall(chunk)))
+        else:
+            position += len(chunk)
+        char_offset += len(chunk)
+
+        if len(chunk) < step:
+            break
+
+        key_positions.append(position)
+        offsets.append(char_offset if is_text else ciphertext_source.tell())
+
+    return VigenereIndex(
+        step,
+        ignore_space,
+        key_positions,
+        offsets,
+        [alphabet.cases for alphabet in alphabets],
+        source,
+    )
+
+
+def save_index(index: VigenereIndex, path: str) -> None:
+    """
+    Save the checkpoint index to a sidecar file.
+
+    Args:
+        index (VigenereIndex): The index to save.
+        path (str): Path of the sidecar file.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(index._asdict(), file)
+
+
+def load_index(path: str) -> VigenereIndex:
+    """
+    Load the checkpoint index from a sidecar file.
+
+    Args:
+        path (str): Path of the sidecar file.
+
+    Returns:
+        VigenereIndex: The loaded index.
+    """
+    with open(path, encoding="utf-8") as file:
+        return VigenereIndex(**json.load(file))
+
+
+def decrypt_range(
+    ciphertext_source: tp.Union[str, tp.TextIO],
+    key: str,
+    start: int,
+    end: int,
+    index: VigenereIndex,
+) -> str:
+    """
+    Decrypt only characters from start to end (not included)
+    of the ciphertext, seeking to the nearest checkpoint of the index.
+    The ciphertext is decrypted with the alphabets stored in the index.
+
+    Args:
+        ciphertext_source (tp.Union[str, tp.TextIO]): The ciphertext
+        or a seekable text file opened for reading.
+        key (str): The key used for the Vigenere cipher.
+        start (int): Character offset of the slice start.
+        end (int): Character offset of the slice end.
+        index (VigenereIndex): Index built by build_index
+        for the same ciphertext given as the same kind of source.
+
+    Returns:
+        str: The decrypted slice.
+
+    Raises:
+        ValueError: If the range is invalid or the index was built
+        for another kind of source.
+
+    Examples:
+        >>> text = "tfvzzvwkeaqv lq aqvpzf"
+        >>> decrypt_range(text, "lsci", 13, 15, build_index(text, step=4))
+        'to'
+    """
+    if not 0 <= start <= end:
+        raise ValueError("Range must satisfy 0 <= start <= end")
+    if _source_kind(ciphertext_source) != index.source:
+        raise ValueError(f"Index was built for a {index.source} source")
+
+    alphabets = tuple(Alphabet(*cases) for cases in index.alphabets)
+    checkpoint = min(start // index.step, len(index.offsets) - 1)
+    checkpoint_start = checkpoint * index.step
+
+    if index.source == "text":
+        offset = index.offsets[checkpoint]
+        chunk = ciphertext_source[offset : offset + end - checkpoint_start]
+    else:
+        ciphertext_source.seek(index.offsets[checkpoint])
+        chunk = ciphertext_source.read(end - checkpoint_start)
+
+    int_key = [-i for i in decrypt_key(key, alphabets)]
+    plaintext = _shift_text(
+        chunk,
+        int_key,
+        index.ignore_space,
+        index.key_positions[checkpoint],
+        alphabets,
+    )
+
+    return plaintext[start - checkpoint_start :]
+
+
+def _score_words(text: str, dictionary: tp.Set[str]) -> float:
+    """
+    Share of words of the text that are in the dictionary.
+
+    Args:
+        text (str): The text to score.
+        dictionary (tp.Set[str]): A set of valid lowercase words.
+
+    Returns:
+        float: Score from 0 to 1 (0 for text without words).
+
+    Examples:
+        >>> _score_words("Hello how are you", {"hello", "you"})
+        0.5
+    """
+    words = text.lower().split()
+
+    if not words:
+        return 0.0
+
+    return sum(1 for word in words if word in dictionary) / len(words)
+
+
+def _words_prefix(text: str, prefix_length: int) -> str:
+    """
+    Cut the text to prefix_length characters without splitting a word:
+    the trailing partial word is left out. Returns the whole text
+    if the prefix has no word boundary.
+
+    Examples:
+        >>> _words_prefix("hello how are you", 11)
+        'hello how'
+        >>> _words_prefix("hello how are you", 9)
+        'hello how'
+        >>> _words_prefix("hello how are you", 3)
+        'hello how are you'
+    """
+    if len(text) <= prefix_length or text[prefix_length].isspace():
+        return text[:prefix_length]
+
+    words = text[:prefix_length].rsplit(maxsplit=1)
+    if len(words) < 2:
+        return text
+
+    return words[0]
+
+
+def _make_attack_state(
+    stop_event: tp.Any,
+    ciphertext: str,
+    dictionary: tp.Set[str],
+    threshold: float,
+    prefix_length: int,
+    ignore_space: bool,
+    alphabets: tp.Tuple[Alphabet, ...],
+) -> dict:
+    """
+    Collect the attack parameters shared by all batches.
+    """
+    return {
+        "stop_event": stop_event,
+        "ciphertext": ciphertext,
+        "prefix": _words_prefix(ciphertext, prefix_length),
+        "dictionary": dictionary,
+        "threshold": threshold,
+        "ignore_space": ignore_space,
+        "alphabets": alphabets,
+    }
+
+
+def _init_attack_worker(*args: tp.Any) -> None:
+    """
+    Store the shared attack parameters once per worker process,
+    so batches carry only the candidate keys.
+    """
+    _attack_state.update(_make_attack_state(*args))
+
+
+def _attack_batch(
+    candidates: list[str], state: tp.Optional[dict] = None
+) -> tp.Optional[str]:
+    """
+    Check a batch of candidate keys: score the decrypted prefix first,
+    then confirm on the full text. Stops early if another worker
+    has already found the key.
+
+    Args:
+        candidates (list[str]): Candidate keys.
+        state (tp.Optional[dict], optional): Attack parameters made by
+        _make_attack_state. Defaults to the state of the worker process.
+
+    Returns:
+        tp.Optional[str]: The first key that passes the threshold,
+        None if there is no such key in the batch.
+    """
+    if state is None:
+        state = _attack_state
+
+    stop_event = state["stop_event"]
+    dictionary = state["dictionary"]
+    threshold = state["threshold"]
+    ignore_space = state["ignore_space"]
+    alphabets = state["alphabets"]
+
+    for candidate in candidates:
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        try:
+            int_key = [-i for i in decrypt_key(candidate, alphabets)]
+        except (AssertionError, ValueError):
+            continue
+
+        prefix = _shift_text(
+            state["prefix"], int_key, ignore_space, alphabets=alphabets
+        )
+        if _score_words(prefix, dictionary) < threshold:
+            continue
+
+        text = _shift_text(
+            state["ciphertext"], int_key, ignore_space, alphabets=alphabets
+        )
+        if _score_words(text, dictionary) >= threshold:
+            return candidate
+
+    return None
+
+
+def vigenere_breaker_dictionary(
+    ciphertext: str,
+    candidates: tp.Iterable[str],
+    dictionary: tp.Set[str],
+    threshold: float = 0.5,
+    workers: tp.Optional[int] = None,
+    batch_size: int = ATTACK_BATCH_SIZE,
+    prefix_length: int = ATTACK_PREFIX_LENGTH,
+    ignore_space: bool = False,
+    alphabets: tp.Tuple[Alphabet, ...] = DEFAULT_ALPHABETS,
+) -> tp.Optional[str]:
+    """
+    Attempts to break a Vigenere cipher with a wordlist of candidate keys.
+    Each candidate is checked on a short decrypted prefix first and only
+    promising ones are decrypted fully. Candidates are read lazily in
+    batches and checked in a process pool; all workers stop as soon as
+    a key with share of dictionary words >= threshold is found.
+
+    Args:
+        ciphertext (str): The encrypted message.
+        candidates (tp.Iterable[str]): Candidate keys, e.g. an opened
+        wordlist file (surrounding whitespace is stripped, candidates
+        with characters out of the alphabets are skipped).
+        dictionary (tp.Set[str]): A set of valid lowercase words.
+        threshold (float, optional): Minimal share of dictionary words.
+        Defaults to 0.5.
+        workers (tp.Optional[int], optional): Number of processes,
+        1 runs in the current process. Defaults to the number of CPUs.
+        batch_size (int, optional): Candidates sent to a worker at once.
+        Defaults to ATTACK_BATCH_SIZE.
+        prefix_length (int, optional): Length of the prefix
+        for the first-stage score, a trailing partial word is left out.
+        Defaults to ATTACK_PREFIX_LENGTH.
+        ignore_space (bool, optional): If True,
+        characters out of the alphabets will be ignored in indexing.
+        Defaults to False.
+        alphabets (tp.Tuple[Alphabet, ...], optional): Alphabets
+        of the letters to shift. Defaults to DEFAULT_ALPHABETS.
+
+    Returns:
+        tp.Optional[str]: The found key, None if no candidate passed.
+
+    Raises:
+        ValueError: If batch_size or workers is not positive.
+
+    Examples:
+        >>> vigenere_breaker_dictionary( \
+                encrypt_vigenere("hello how are you", "key"), \
+                ["lemon", "key", "python"], \
+                {"hello", "how", "are", "you"}, \
+                workers=1, \
+            )
+        'key'
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    if workers is not None and workers <= 0:
+        raise ValueError("Number of workers must be positive")
+
+    stripped = (candidate.strip() for candidate in candidates)
+    batches = iter(lambda: list(itertools.islice(stripped, batch_size)), [])
+    init_args = (ciphertext, dictionary, threshold, prefix_length)
+    workers = workers or multiprocessing.cpu_count()
+
+    if workers == 1:
+        state = _make_attack_state(None, *init_args, ignore_space, alphabets)
+        for batch in batches:
+            key = _attack_batch(batch, state)
+            if key is not None:
+                return key
+        return None
+
+    stop_event = multiprocessing.Event()
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_attack_worker,
+        initargs=(stop_event, *init_args, ignore_space, alphabets),
+    )
+    # Keep only a few batches in flight so huge wordlists are not
+    # loaded into memory at once.
+    pending = {
+        executor.submit(_attack_batch, batch)
+        for batch in itertools.islice(batches, 2 * workers)
+    }
+    key = None
+
+    try:
+        while pending and key is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result() is not None:
+                    key = future.result()
+                    break
+
+                batch = next(batches, None)
+                if batch is not None:
+                    pending.add(executor.submit(_attack_batch, batch))
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return key
 
 
 if __name__ == "__main__":